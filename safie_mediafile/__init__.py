@@ -1,10 +1,29 @@
+from contextlib import asynccontextmanager
 from datetime import datetime
-from typing import BinaryIO, Optional
+from typing import AsyncIterator, BinaryIO, Optional
 
-from safie_mediafile._client import async_client, SAFIE_API_BASE_URL
+from safie_mediafile._client import async_client, SafieClient, SAFIE_API_BASE_URL
 from safie_mediafile._endpoints._mediafile import MediaFileAPI
 from safie_mediafile._endpoints._device import DeviceAPI
 
+# Minimum time to wait for a media file to be generated, and the additional waiting time
+# allowed per second of requested footage.
+_MEDIAFILE_READY_TIMEOUT_MIN = 600.0
+_MEDIAFILE_READY_TIMEOUT_PER_SECOND = 2.0
+
+
+@asynccontextmanager
+async def _client_or_new(
+    client: Optional[SafieClient], api_token: Optional[str], base_url: Optional[str]
+) -> AsyncIterator[SafieClient]:
+    """Yield the given client, or a new client for api_token if no client is given."""
+    if client is not None:
+        yield client
+        return
+    assert api_token is not None, "Either api_token or client must be provided"
+    async with async_client(api_token=api_token, base_url=base_url) as new_client:
+        yield new_client
+
 
 async def create_and_download_mediafile(
     *,
@@ -12,8 +31,10 @@ async def create_and_download_mediafile(
     start_time: datetime,
     end_time: datetime,
     file: BinaryIO,
-    api_token: str,
+    api_token: Optional[str] = None,
     base_url: Optional[str] = None,
+    offload_writes: bool = False,
+    client: Optional[SafieClient] = None,
 ):
     """
     Create and download a media file for the specified device and time period
@@ -25,21 +46,33 @@ async def create_and_download_mediafile(
         file: File-like object to write the media file to
         api_token: Safie API token
         base_url: Base URL for Safie API. If None, default URL will be used
+        offload_writes: If True, write the file in a worker thread while downloading.
+            Useful when running several downloads concurrently
+        client: Client created with async_client to reuse its connection.
+            If None, a new client is created from api_token and base_url
 
     Returns:
         str: Path of the saved file
     """
-    async with async_client(api_token=api_token, base_url=base_url) as client:
-        mediafile_api = MediaFileAPI(client)
+    async with _client_or_new(client, api_token, base_url) as safie_client:
+        mediafile_api = MediaFileAPI(safie_client)
         print(f"Creating mediafile for device {device_id} from {start_time} to {end_time}")
         request_id = await mediafile_api.create_mediafile(device_id, start_time, end_time)
         print(f"Mediafile request ID: {request_id}")
-        download_url = await mediafile_api.wait_for_mediafile_ready(device_id, request_id)
+        ready_timeout = max(
+            _MEDIAFILE_READY_TIMEOUT_MIN,
+            (end_time - start_time).total_seconds() * _MEDIAFILE_READY_TIMEOUT_PER_SECOND,
+        )
+        download_url = await mediafile_api.wait_for_mediafile_ready(
+            device_id, request_id, total_timeout=ready_timeout
+        )
         print(f"Downloading mediafile from {download_url}")
 
         download_success = False
         try:
-            await mediafile_api.download_mediafile(download_url, file)
+            await mediafile_api.download_mediafile(
+                download_url, file, offload_writes=offload_writes
+            )
             download_success = True
         finally:
             # Only delete the request if download was successful
@@ -50,10 +83,11 @@ async def create_and_download_mediafile(
 
 async def find_device_id(
     *,
-    api_token: str,
+    api_token: Optional[str] = None,
     serial: Optional[str] = None,
     name: Optional[str] = None,
     base_url: Optional[str] = None,
+    client: Optional[SafieClient] = None,
 ) -> str:
     """
     Get device ID from serial number or device name
@@ -63,14 +97,16 @@ async def find_device_id(
         serial: Serial number
         name: Device name
         base_url: Base URL for Safie API. If None, default URL will be used
+        client: Client created with async_client to reuse its connection.
+            If None, a new client is created from api_token and base_url
 
     Returns:
         str: Device ID
     """
     assert serial is not None or name is not None, "Either serial or name must be provided"
 
-    async with async_client(api_token=api_token, base_url=base_url) as client:
-        device_api = DeviceAPI(client)
+    async with _client_or_new(client, api_token, base_url) as safie_client:
+        device_api = DeviceAPI(safie_client)
         return await device_api.find_device_id(serial=serial, name=name)
 
 
@@ -80,5 +116,6 @@ __all__ = [
     "async_client",
     "MediaFileAPI",
     "DeviceAPI",
+    "SafieClient",
     "SAFIE_API_BASE_URL",
 ]
@@ -1,14 +1,98 @@
 import asyncio
-from datetime import datetime, tzinfo
+import re
+from datetime import datetime, timedelta, timezone, tzinfo
+from functools import lru_cache
+from dateutil.parser import isoparse
 from dateutil.tz import gettz
 from pathlib import Path
-from typing import Optional
+from typing import Callable, Dict, Optional, Tuple
 
 import click
 
 from safie_mediafile import SAFIE_API_BASE_URL
 
-from ._downloader import download_media_from_device
+from ._downloader import DEFAULT_MAX_CONCURRENCY, download_media_from_device
+
+# _FALLBACK_PARSERS are tried in order when _parse_iso rejects a string. The standard library
+# parser accepts some forms ciso8601 does not (e.g. offsets with seconds), and dateutil's some
+# forms the standard library does not before Python 3.11 (e.g. fractional seconds with other
+# than 3 or 6 digits)
+try:
+    # ciso8601 is a much faster ISO 8601 parser. Use it when it is installed
+    import ciso8601  # type: ignore[import-not-found, unused-ignore]
+
+    _parse_iso: Callable[[str], datetime] = ciso8601.parse_datetime
+    _FALLBACK_PARSERS: Tuple[Callable[[str], datetime], ...] = (datetime.fromisoformat, isoparse)
+except ImportError:
+    _parse_iso = datetime.fromisoformat
+    _FALLBACK_PARSERS = (isoparse,)
+
+# Used to reject strings which are obviously not ISO 8601 time strings before trying the
+# parsers: a year followed only by digits, separators, designators and offsets. Whether the
+# string is actually valid is left to the parsers
+_ISO_RE = re.compile(r"^\d{4}[-\d:.,+WTtZz ]*$")
+
+# Fixed-offset timezones by UTC offset, shared by all parsed time strings with that offset
+_TZ_CACHE: Dict[timedelta, tzinfo] = {timedelta(0): timezone.utc}
+
+
+@lru_cache(maxsize=32)
+def _cached_gettz(name: Optional[str]) -> Optional[tzinfo]:
+    """Get timezone by name, caching the result to avoid re-reading zoneinfo files.
+
+    Args:
+        name: Timezone name (e.g. UTC, Asia/Tokyo). If None, the local timezone is used
+
+    Returns:
+        tzinfo object, or None if the timezone is unknown
+    """
+    return gettz(name)
+
+
+@lru_cache(maxsize=256)
+def _parse_iso_string(time_string: str) -> datetime:
+    """Parse an ISO8601 time string, caching the result for repeated strings.
+
+    Only the time string is used as the cache key, as dateutil timezones are not hashable.
+
+    Args:
+        time_string: ISO8601 format time string
+
+    Returns:
+        datetime object, naive if the string has no timezone info
+
+    Raises:
+        ValueError: If time string format is invalid
+    """
+    if not _ISO_RE.match(time_string):
+        raise ValueError(f"Invalid time format: {time_string}")
+    iso_string = time_string
+    # datetime.fromisoformat() accepts the 'Z' suffix for UTC only since Python 3.11, and
+    # never a lowercase 'z'. Rewrite both so that the fast parser handles them
+    if time_string.endswith(("Z", "z")):
+        iso_string = time_string[:-1] + "+00:00"
+    try:
+        dt = _parse_iso(iso_string)
+    except ValueError as e:
+        error = e
+        for parse in _FALLBACK_PARSERS:
+            try:
+                dt = parse(iso_string)
+                break
+            except ValueError as e:
+                error = e
+        else:
+            raise ValueError(f"Invalid time format: {time_string}") from error
+    if dt.tzinfo is not None:
+        # Use a shared timezone object instead of the one created by the parser
+        offset = dt.utcoffset()
+        if offset is not None:
+            tz = _TZ_CACHE.get(offset)
+            if tz is None:
+                tz = _TZ_CACHE[offset] = timezone(offset)
+            if tz is not dt.tzinfo:
+                dt = dt.replace(tzinfo=tz)
+    return dt
 
 
 def _parse_time_string(time_string: str, default_tz: Optional[tzinfo]) -> datetime:
@@ -24,20 +108,11 @@ def _parse_time_string(time_string: str, default_tz: Optional[tzinfo]) -> dateti
     Raises:
         ValueError: If time string format is invalid
     """
-    try:
-        # Try parsing as is first (may contain timezone info)
-        dt = datetime.fromisoformat(time_string)
-        # If no timezone info, apply the default timezone
-        if dt.tzinfo is None and default_tz is not None:
-            dt = dt.replace(tzinfo=default_tz)
-        return dt
-    except ValueError as e:
-        # Handle 'Z' suffix for UTC
-        if time_string.endswith("Z"):
-            time_string = time_string.replace("Z", "+00:00")
-            return datetime.fromisoformat(time_string)
-        # Try other formats or raise error
-        raise ValueError(f"Invalid time format: {time_string}") from e
+    dt = _parse_iso_string(time_string)
+    # If no timezone info, apply the default timezone
+    if dt.tzinfo is None and default_tz is not None:
+        dt = dt.replace(tzinfo=default_tz)
+    return dt
 
 
 @click.command()
@@ -71,6 +146,13 @@ def _parse_time_string(time_string: str, default_tz: Optional[tzinfo]) -> dateti
     help="Timezone for interpreting times with timezone info (e.g. UTC, Asia/Tokyo, JST, etc.)."
     "If not specified, it will be inferred from time string or the local time.",
 )
+@click.option(
+    "--max-concurrency",
+    type=click.IntRange(min=1),
+    default=DEFAULT_MAX_CONCURRENCY,
+    show_default=True,
+    help="Maximum number of segments downloaded concurrently for requests longer than 10 minutes.",
+)
 def main(
     serial: Optional[str],
     name: Optional[str],
@@ -80,6 +162,7 @@ def main(
     api_token: str,
     base_url: Optional[str],
     timezone_str: str,
+    max_concurrency: int,
 ):
     """Download Safie media file
 
@@ -96,7 +179,7 @@ def main(
             raise ValueError("Either --serial or --name must be specified")
 
         # Parse timezone and time strings
-        default_tz = gettz(timezone_str)
+        default_tz = _cached_gettz(timezone_str)
         start = _parse_time_string(start_time, default_tz)
         end = _parse_time_string(end_time, default_tz)
 
@@ -114,6 +197,7 @@ def main(
                 output_path=Path(output_path),
                 api_token=api_token,
                 base_url=base_url,
+                max_concurrency=max_concurrency,
             )
         )
 
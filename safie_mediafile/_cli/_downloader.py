@@ -2,7 +2,6 @@ import tempfile
 from typing import List, Optional, Tuple
 from datetime import datetime, timedelta
 from pathlib import Path
-import subprocess
 import os
 import shutil
 import asyncio
@@ -10,12 +9,15 @@ import asyncio
 from imageio_ffmpeg import get_ffmpeg_exe  # type: ignore[import-untyped]
 
 from safie_mediafile import (
+    SafieClient,
+    async_client,
     create_and_download_mediafile,
     find_device_id,
 )
 
 _MIN_DURATION = timedelta(minutes=1)
 _MAX_DURATION = timedelta(minutes=10)
+DEFAULT_MAX_CONCURRENCY = 4
 _FFMPEG = get_ffmpeg_exe()
 
 
@@ -27,25 +29,31 @@ async def download_media_from_device(
     output_path: Path,
     api_token: str,
     base_url: Optional[str],
+    max_concurrency: int = DEFAULT_MAX_CONCURRENCY,
 ):
     """Download media from a device with clipping if necessary."""
-    # Get device ID
-    device_id = await find_device_id(
-        api_token=api_token, serial=serial, name=name, base_url=base_url
-    )
-
-    segments = _create_time_segments(start_time, end_time, _MAX_DURATION)
-    if len(segments) > 1:
-        print(
-            f"Requested duration ({end_time - start_time}) is longer than 10 minutes. "
-            f"Will download {len(segments)} segments and merge them afterwards."
-        )
+    # Share one client (and thus one connection) between the device lookup and all segments
+    async with async_client(api_token=api_token, base_url=base_url) as client:
+        # Get device ID
+        device_id = await find_device_id(serial=serial, name=name, client=client)
+
+        segments = _create_time_segments(start_time, end_time, _MAX_DURATION)
+        if len(segments) > 1:
+            print(
+                f"Requested duration ({end_time - start_time}) is longer than 10 minutes. "
+                f"Will download {len(segments)} segments and merge them afterwards."
+            )
 
-    with tempfile.TemporaryDirectory() as temp_dir:
-        segments_paths = await _download_segments(
-            device_id, segments, output_path.name, Path(temp_dir), api_token, base_url
-        )
-        _merge_segments(segments_paths, output_path)
+        with tempfile.TemporaryDirectory() as temp_dir:
+            downloaded_segments = await _download_segments(
+                device_id,
+                segments,
+                output_path.name,
+                Path(temp_dir),
+                client,
+                max_concurrency,
+            )
+            await _merge_segments(downloaded_segments, output_path, Path(temp_dir))
 
 
 def _create_time_segments(
@@ -76,35 +84,65 @@ async def _download_segments(
     segments: List[Tuple[datetime, datetime]],
     output_file_name: str,
     temp_dir: Path,
-    api_token: str,
-    base_url: Optional[str],
-) -> List[Path]:
-    """Download segments from a device."""
+    client: SafieClient,
+    max_concurrency: int,
+) -> List[Tuple[Path, Optional[float]]]:
+    """
+    Download segments from a device, at most max_concurrency at a time
+
+    Returns:
+        List of (segment_path, clip_duration) tuples. clip_duration is the duration in seconds
+        the segment has to be clipped to when merging, or None if it is used as is.
+    """
+    # Overlap disk writes with network receive only when segments are downloaded concurrently
+    offload_writes = len(segments) > 1 and max_concurrency > 1
+    semaphore = asyncio.Semaphore(max_concurrency)
+
+    async def _bounded_download(
+        start_time: datetime, end_time: datetime, output_path: Path
+    ) -> Optional[float]:
+        async with semaphore:
+            return await _download_segment(
+                device_id,
+                start_time,
+                end_time,
+                output_path,
+                client,
+                offload_writes,
+            )
+
     segments_paths = []
     tasks = []
     for i, (start_time, end_time) in enumerate(segments):
         temp_output_path = temp_dir / f"{i}_{output_file_name}"
         segments_paths.append(temp_output_path)
-        task = asyncio.create_task(
-            _download_with_clipping(
-                device_id, start_time, end_time, temp_output_path, api_token, base_url
-            )
-        )
-        tasks.append(task)
-    await asyncio.gather(*tasks)
-    return segments_paths
+        tasks.append(asyncio.create_task(_bounded_download(start_time, end_time, temp_output_path)))
+    try:
+        clip_durations = await asyncio.gather(*tasks)
+    except BaseException:
+        # Cancel the remaining downloads so that no task keeps writing into the temp dir
+        for task in tasks:
+            task.cancel()
+        await asyncio.gather(*tasks, return_exceptions=True)
+        raise
+    return list(zip(segments_paths, clip_durations))
 
 
-async def _download_with_clipping(
+async def _download_segment(
     device_id: str,
     start_time: datetime,
     end_time: datetime,
     output_path: Path,
-    api_token: str,
-    base_url: Optional[str],
-):
-    original_end_time = end_time
+    client: SafieClient,
+    offload_writes: bool,
+) -> Optional[float]:
+    """
+    Download a segment, extending it to the minimum duration supported by the API if necessary
 
+    Returns:
+        Duration in seconds the downloaded segment has to be clipped to, or None if no
+        clipping is needed. Clipping is done by _merge_segments.
+    """
     # Check if duration is less than 1 minute
     duration = end_time - start_time
     if duration < _MIN_DURATION:
@@ -112,57 +150,20 @@ async def _download_with_clipping(
             f"Requested duration ({duration}) is less than 1 minute. Will download a 1-minute video and clip it afterwards.",
         )
         adjusted_end_time = start_time + _MIN_DURATION
-        needs_clipping = True
+        clip_duration: Optional[float] = duration.total_seconds()
     else:
-        needs_clipping = False
         adjusted_end_time = end_time
+        clip_duration = None
 
     await _download_media(
-        device_id, start_time, adjusted_end_time, output_path, api_token, base_url
+        device_id,
+        start_time,
+        adjusted_end_time,
+        output_path,
+        client,
+        offload_writes,
     )
-
-    if needs_clipping:
-        print(
-            f"Clipping video to the original requested duration: {start_time} to {original_end_time}"
-        )
-        temp_output_path = output_path.with_suffix(".temp.mp4")
-        try:
-            # Calculate duration for ffmpeg
-            clip_duration = (original_end_time - start_time).total_seconds()
-
-            # ffmpeg command
-            cmd = [
-                _FFMPEG,
-                "-i",
-                str(output_path),
-                "-ss",
-                "0",
-                "-t",
-                str(clip_duration),
-                "-c",
-                "copy",  # Copy streams without re-encoding
-                "-y",  # Overwrite existing files
-                str(temp_output_path),
-            ]
-            result = subprocess.run(cmd, capture_output=True, text=True, check=False)
-
-            if result.returncode != 0:
-                raise RuntimeError("Failed to clip the video with ffmpeg.")
-
-            # Replace original file with clipped file
-            shutil.move(str(temp_output_path), str(output_path))
-
-        except FileNotFoundError:
-            raise RuntimeError(
-                "Error: ffmpeg command not found. Please ensure ffmpeg is installed and in your PATH."
-            )
-        except Exception as e:
-            raise RuntimeError(f"An error occurred during clipping: {e}")
-
-        finally:
-            # Remove temporary file if it still exists
-            if temp_output_path.exists():
-                os.remove(temp_output_path)
+    return clip_duration
 
 
 async def _download_media(
@@ -170,79 +171,141 @@ async def _download_media(
     start_time: datetime,
     end_time: datetime,
     output_path: Path,
-    api_token: str,
-    base_url: Optional[str],
+    client: SafieClient,
+    offload_writes: bool,
 ):
-    """Process the device ID lookup and media file download in a single async function."""
+    """Process the device ID lookup and media file download in a single async function.
+
+    The media file is streamed into a sibling ".part" file which replaces output_path only
+    once the download has completed, so output_path never holds a partial download.
+    """
+    part_path = output_path.with_name(output_path.name + ".part")
     try:
         output_path.parent.mkdir(parents=True, exist_ok=True)
-        with open(output_path, "wb") as f:
+        with open(part_path, "wb") as f:
             await create_and_download_mediafile(
                 device_id=device_id,
                 start_time=start_time,
                 end_time=end_time,
                 file=f,
-                api_token=api_token,
-                base_url=base_url,
+                client=client,
+                offload_writes=offload_writes,
             )
-    except Exception as e:
-        output_path.unlink(missing_ok=True)
-        raise e
+        os.replace(part_path, output_path)
+    except BaseException:
+        # Also clean up when the download is cancelled because another segment failed
+        part_path.unlink(missing_ok=True)
+        raise
+
+
+def _quote_concat_path(path: Path) -> str:
+    """Quote a path for the ffmpeg concat demuxer, escaping embedded single quotes."""
+    return "'" + str(path).replace("'", "'\\''") + "'"
+
+
+def _build_concat_filelist(segments: List[Tuple[Path, Optional[float]]]) -> str:
+    """
+    Build the file list for the ffmpeg concat demuxer
+
+    Args:
+        segments: List of (segment_path, clip_duration) tuples
+
+    Returns:
+        Content of the file list
+    """
+    lines = []
+    for segment_file, clip_duration in segments:
+        lines.append(f"file {_quote_concat_path(segment_file)}")
+        if clip_duration is not None:
+            lines.append(f"outpoint {clip_duration}")
+    return "\n".join(lines) + "\n"
 
 
-def _merge_segments(segment_files: List[Path], output_path: Path) -> None:
+async def _merge_segments(
+    segments: List[Tuple[Path, Optional[float]]], output_path: Path, temp_dir: Path
+) -> None:
     """
     Merge video segments using ffmpeg
 
+    Segments with a clip duration are trimmed with the concat demuxer's outpoint directive,
+    so clipping and merging are done by a single ffmpeg invocation.
+
     Args:
-        segment_files: List of segment file paths
+        segments: List of (segment_path, clip_duration) tuples
         output_path: Path to save the merged output file
+        temp_dir: Directory to write the ffmpeg file list to
 
     Raises:
         SafieMediaFileError: If merging fails
     """
-    if not segment_files:
+    if not segments:
         raise RuntimeError("No segments to merge")
 
-    # If only one segment, just copy it
-    if len(segment_files) == 1:
-        shutil.move(str(segment_files[0]), str(output_path))
-        return
-
-    # Create a file list for ffmpeg
-    filelist_path = os.path.join(os.path.dirname(segment_files[0]), "filelist.txt")
-    with open(filelist_path, "w") as f:
-        for segment_file in segment_files:
-            f.write(f"file '{segment_file}'\n")
+    # If only one segment which needs no clipping, just move it
+    move_only = len(segments) == 1 and segments[0][1] is None
 
+    # Write into a sibling ".part" file which replaces output_path only once it is complete, so
+    # output_path never holds a partial file
+    if move_only:
+        part_path = output_path.with_name(output_path.name + ".part")
+    else:
+        # ffmpeg chooses the output format from the extension, so keep it last
+        part_path = output_path.with_name(output_path.name + ".part" + output_path.suffix)
     try:
-        # Merge segments using ffmpeg
-        cmd = [
-            _FFMPEG,
-            "-f",
-            "concat",
-            "-safe",
-            "0",
-            "-i",
-            str(filelist_path),
-            "-c",
-            "copy",
-            "-y",
-            str(output_path),
-        ]
-        # Run ffmpeg command
-        subprocess.run(cmd, stdout=subprocess.PIPE, stderr=subprocess.PIPE, check=True)
-        print(f"Successfully merged {len(segment_files)} segments into {output_path}")
-
-    except subprocess.CalledProcessError as e:
+        if move_only:
+            # This is a rename on the same filesystem; across filesystems copyfile uses
+            # sendfile on Linux and skips copying metadata.
+            shutil.move(str(segments[0][0]), str(part_path), copy_function=shutil.copyfile)
+        else:
+            await _concat_segments(segments, part_path, temp_dir)
+        os.replace(part_path, output_path)
+    except BaseException:
+        # Also clean up when the merge is interrupted
+        part_path.unlink(missing_ok=True)
+        raise
+
+    if not move_only:
+        print(f"Successfully merged {len(segments)} segments into {output_path}")
+
+
+async def _concat_segments(
+    segments: List[Tuple[Path, Optional[float]]], output_path: Path, temp_dir: Path
+) -> None:
+    """Concatenate and clip video segments into output_path with a single ffmpeg run."""
+    for segment_file, clip_duration in segments:
+        if clip_duration is not None:
+            print(f"Clipping {segment_file.name} to {clip_duration} seconds")
+
+    # Create a file list for ffmpeg. It is removed together with temp_dir
+    filelist_path = temp_dir / "filelist.txt"
+    filelist_path.write_text(_build_concat_filelist(segments), encoding="utf-8")
+
+    # Merge segments using ffmpeg
+    cmd = [
+        _FFMPEG,
+        "-f",
+        "concat",
+        "-safe",
+        "0",
+        "-i",
+        str(filelist_path),
+        "-c",
+        "copy",
+        "-y",
+        str(output_path),
+    ]
+    # Run ffmpeg command without blocking the event loop
+    proc = await asyncio.create_subprocess_exec(
+        *cmd, stdout=asyncio.subprocess.PIPE, stderr=asyncio.subprocess.PIPE
+    )
+    try:
+        _, stderr = await proc.communicate()
+    except BaseException:
+        # Do not leave ffmpeg writing to output_path when the merge is cancelled
+        proc.kill()
+        await proc.wait()
+        raise
+    if proc.returncode != 0:
         raise RuntimeError(
-            f"Failed to merge segments: {e.stderr.decode() if e.stderr else str(e)}"
-        ) from e
-
-    finally:
-        # Clean up the file list
-        if os.path.exists(filelist_path):
-            try:
-                os.remove(filelist_path)
-            except Exception:
-                pass
+            f"Failed to merge segments: {stderr.decode() if stderr else proc.returncode}"
+        )
@@ -1,10 +1,35 @@
-from typing import AsyncGenerator, Optional
+from typing import Any, AsyncGenerator, Callable, Optional
+import json
+import logging
 import httpx
 from contextlib import asynccontextmanager
 
 
+try:
+    # msgspec decodes JSON considerably faster than the standard library. Use it when installed
+    import msgspec  # type: ignore[import-not-found, unused-ignore]
+
+    _decode_json: Callable[[bytes], Any] = msgspec.json.decode
+except ImportError:
+    _decode_json = json.loads
+
+logger = logging.getLogger(__name__)
+
 SAFIE_API_BASE_URL = "https://openapi.safie.link"
 
+# All requests of a workflow (create, status polling, download, delete) and the parallel
+# segment downloads of the CLI share one client, so multiplex them over HTTP/2.
+_HTTP_LIMITS = httpx.Limits(
+    max_keepalive_connections=20,
+    max_connections=100,
+    keepalive_expiry=60.0,
+)
+_HTTP_TIMEOUT = httpx.Timeout(30.0, read=300.0)
+
+# Streamed responses (media files) are coalesced into chunks of this size before being
+# yielded, so that large downloads do not resume the generator for every small network read.
+_STREAM_CHUNK_SIZE = 1 << 20
+
 
 class SafieClient:
     """Safie API client"""
@@ -12,18 +37,17 @@ class SafieClient:
     def __init__(
         self,
         client: httpx.AsyncClient,
-        api_token: str,
+        *,
         base_url: Optional[str] = None,
     ):
         """
         Args:
-            client: httpx AsyncClient instance
-            api_token: Safie API token
+            client: httpx AsyncClient instance. It must send the Safie API key header
+                by default, as the one created by async_client does
             base_url: Base URL for Safie API. If None, default URL will be used
         """
         self._base_url = base_url or SAFIE_API_BASE_URL
         self._client = client
-        self._headers = {"Safie-API-Key": api_token}
 
     async def get(self, path: str, **kwargs) -> httpx.Response:
         """
@@ -37,8 +61,8 @@ class SafieClient:
             httpx.Response: Response
         """
         url = f"{self._base_url}{path}"
-        response = await self._client.get(url, headers=self._headers, **kwargs)
-        print(f"get response: {response.json()}")
+        response = await self._client.get(url, **kwargs)
+        logger.debug("GET %s -> %s", path, response.status_code)
         response.raise_for_status()
         return response
 
@@ -54,11 +78,39 @@ class SafieClient:
             httpx.Response: Response
         """
         url = f"{self._base_url}{path}"
-        response = await self._client.post(url, headers=self._headers, **kwargs)
-        print(f"post response: {response.json()}")
+        response = await self._client.post(url, **kwargs)
+        logger.debug("POST %s -> %s", path, response.status_code)
         response.raise_for_status()
         return response
 
+    async def get_json(self, path: str, **kwargs) -> Any:
+        """
+        Send GET request and return the parsed JSON body
+
+        Args:
+            path: API path
+            **kwargs: Request parameters
+
+        Returns:
+            Any: Parsed response body
+        """
+        response = await self.get(path, **kwargs)
+        return _decode_json(response.content)
+
+    async def post_json(self, path: str, **kwargs) -> Any:
+        """
+        Send POST request and return the parsed JSON body
+
+        Args:
+            path: API path
+            **kwargs: Request parameters
+
+        Returns:
+            Any: Parsed response body
+        """
+        response = await self.post(path, **kwargs)
+        return _decode_json(response.content)
+
     async def delete(self, path: str, **kwargs) -> httpx.Response:
         """
         Send DELETE request
@@ -71,39 +123,52 @@ class SafieClient:
             httpx.Response: Response
         """
         url = f"{self._base_url}{path}"
-        response = await self._client.delete(url, headers=self._headers, **kwargs)
-        print(f"delete response: {response.status_code}")
+        response = await self._client.delete(url, **kwargs)
+        logger.debug("DELETE %s -> %s", path, response.status_code)
         response.raise_for_status()
         return response
 
-    async def sync_stream(self, url: str, **kwargs) -> AsyncGenerator[bytes, None]:
+    async def sync_stream(
+        self, url: str, chunk_size: Optional[int] = _STREAM_CHUNK_SIZE, **kwargs
+    ) -> AsyncGenerator[bytes, None]:
         """
         Send streaming request
 
         Args:
             url: URL
+            chunk_size: Size of the yielded chunks (1 MiB by default).
+                If None, chunks are yielded as received
             **kwargs: Request parameters
 
         Returns:
             httpx.Response: Response
         """
-        async with self._client.stream("GET", url, headers=self._headers, **kwargs) as response:
+        async with self._client.stream("GET", url, **kwargs) as response:
             response.raise_for_status()
-            async for chunk in response.aiter_bytes():
+            async for chunk in response.aiter_bytes(chunk_size=chunk_size):
                 yield chunk
 
 
 @asynccontextmanager
-async def async_client(api_token: str, base_url: Optional[str] = None):
+async def async_client(
+    api_token: str, base_url: Optional[str] = None, limits: Optional[httpx.Limits] = None
+):
     """
     Create a SafieClient instance as an async context manager
 
     Args:
         api_token: Safie API token
         base_url: Base URL for Safie API. If None, default URL will be used
+        limits: Connection pool limits. If None, default limits will be used.
+            Raise them when sending many requests concurrently
 
     Yields:
         SafieClient: Client instance
     """
-    async with httpx.AsyncClient() as httpx_client:
-        yield SafieClient(httpx_client, api_token, base_url)
+    async with httpx.AsyncClient(
+        headers={"Safie-API-Key": api_token},
+        http2=True,
+        limits=limits or _HTTP_LIMITS,
+        timeout=_HTTP_TIMEOUT,
+    ) as httpx_client:
+        yield SafieClient(httpx_client, base_url=base_url)
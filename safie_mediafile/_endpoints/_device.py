@@ -1,4 +1,5 @@
-from typing import Optional, Dict, Any
+import asyncio
+from typing import Any, AsyncIterator, Dict, List, Optional
 
 from safie_mediafile._client import SafieClient
 from safie_mediafile._exceptions import SafieMediaFileError
@@ -13,6 +14,11 @@ class DeviceAPI:
             client: SafieClient instance
         """
         self._client = client
+        # Devices fetched so far, shared by all lookups on this instance
+        self._devices: List[Dict[str, Any]] = []
+        self._devices_exhausted = False
+        # Serializes page fetches of concurrent lookups so that no page is fetched twice
+        self._fetch_lock = asyncio.Lock()
 
     async def list_devices(self, offset: int = 0, limit: int = 100) -> Dict[str, Any]:
         """
@@ -26,8 +32,37 @@ class DeviceAPI:
             Dict[str, Any]: Device list information
         """
         params = {"offset": offset, "limit": limit}
-        response = await self._client.get("/v2/devices", params=params)
-        return response.json()
+        return await self._client.get_json("/v2/devices", params=params)
+
+    async def _iter_devices(self, page_size: int = 100) -> AsyncIterator[Dict[str, Any]]:
+        """
+        Iterate over all devices, fetching further pages only when needed
+
+        Pages already fetched by this instance are reused instead of being requested again.
+
+        Args:
+            page_size: Number of devices to retrieve per request
+
+        Yields:
+            Dict[str, Any]: Device information
+        """
+        index = 0
+        while True:
+            if index < len(self._devices):
+                yield self._devices[index]
+                index += 1
+                continue
+            if self._devices_exhausted:
+                return
+            async with self._fetch_lock:
+                # Another lookup may have fetched the next page while waiting for the lock
+                if index < len(self._devices) or self._devices_exhausted:
+                    continue
+                page = await self.list_devices(offset=len(self._devices), limit=page_size)
+                devices = page["list"]
+                self._devices.extend(devices)
+                if len(devices) < page_size:
+                    self._devices_exhausted = True
 
     async def find_device_by_serial(self, serial: str) -> Optional[str]:
         """
@@ -39,8 +74,7 @@ class DeviceAPI:
         Returns:
             Optional[str]: Device ID. None if not found
         """
-        devices = await self.list_devices()
-        for device in devices["list"]:
+        async for device in self._iter_devices():
             if device["serial"] == serial:
                 return device["device_id"]
         return None
@@ -55,8 +89,7 @@ class DeviceAPI:
         Returns:
             Optional[str]: Device ID. None if not found
         """
-        devices = await self.list_devices()
-        for device in devices["list"]:
+        async for device in self._iter_devices():
             if device["setting"]["name"] == name:
                 return device["device_id"]
         return None
@@ -1,11 +1,17 @@
 from datetime import datetime, timezone
 import asyncio
-from typing import BinaryIO
+import random
+from typing import BinaryIO, Dict, List, Optional
 
 from safie_mediafile._client import SafieClient
 from safie_mediafile._exceptions import SafieMediaFileError, SafieMediaFileTimeoutError
 
 
+def _iso_utc(dt: datetime) -> str:
+    """Format a datetime as an ISO 8601 UTC string with microseconds and a 'Z' suffix."""
+    return dt.astimezone(timezone.utc).isoformat(timespec="microseconds").replace("+00:00", "Z")
+
+
 class MediaFileAPI:
     """Class providing API operations for Media Files"""
 
@@ -30,14 +36,10 @@ class MediaFileAPI:
         Returns:
             str: Media file ID
         """
-        data = {
-            "start": start_time.astimezone(timezone.utc).strftime("%Y-%m-%dT%H:%M:%S.%fZ"),
-            "end": end_time.astimezone(timezone.utc).strftime("%Y-%m-%dT%H:%M:%S.%fZ"),
-        }
-        response = await self._client.post(
+        data = {"start": _iso_utc(start_time), "end": _iso_utc(end_time)}
+        result = await self._client.post_json(
             f"/v2/devices/{device_id}/media_files/requests", json=data
         )
-        result = response.json()
         return result["request_id"]
 
     async def list_mediafile_requests(self, device_id: str) -> list:
@@ -47,8 +49,8 @@ class MediaFileAPI:
         Args:
             device_id: Device ID
         """
-        response = await self._client.get(f"/v2/devices/{device_id}/media_files/requests")
-        return response.json()["list"]
+        result = await self._client.get_json(f"/v2/devices/{device_id}/media_files/requests")
+        return result["list"]
 
     async def delete_mediafile_request(self, device_id: str, request_id: str) -> None:
         """
@@ -60,6 +62,53 @@ class MediaFileAPI:
         """
         await self._client.delete(f"/v2/devices/{device_id}/media_files/requests/{request_id}")
 
+    async def delete_mediafile_requests(
+        self, device_id: str, request_ids: List[str], concurrency: int = 8
+    ) -> Dict[str, Exception]:
+        """
+        Delete multiple media file requests
+
+        The API has no batch delete endpoint, so the requests are deleted one by one by a
+        fixed number of concurrent workers.
+
+        Args:
+            device_id: Device ID
+            request_ids: Request IDs to delete
+            concurrency: Maximum number of concurrent delete requests
+
+        Returns:
+            Dict[str, Exception]: Errors of the requests that could not be deleted, by request ID
+
+        Raises:
+            ValueError: If concurrency is less than 1
+        """
+        if concurrency < 1:
+            raise ValueError(f"concurrency must be at least 1, got {concurrency}")
+        queue: "asyncio.Queue[str]" = asyncio.Queue()
+        for request_id in request_ids:
+            queue.put_nowait(request_id)
+        failures: Dict[str, Exception] = {}
+
+        async def worker() -> None:
+            while True:
+                request_id = await queue.get()
+                try:
+                    await self.delete_mediafile_request(device_id, request_id)
+                except Exception as e:
+                    failures[request_id] = e
+                finally:
+                    queue.task_done()
+
+        num_workers = min(concurrency, len(request_ids))
+        workers = [asyncio.create_task(worker()) for _ in range(num_workers)]
+        try:
+            await queue.join()
+        finally:
+            for task in workers:
+                task.cancel()
+            await asyncio.gather(*workers, return_exceptions=True)
+        return failures
+
     async def get_mediafile_status(self, device_id: str, request_id: str) -> dict:
         """
         Get the status of a media file
@@ -71,26 +120,42 @@ class MediaFileAPI:
         Returns:
             dict: Media file status information
         """
-        response = await self._client.get(
+        return await self._client.get_json(
             f"/v2/devices/{device_id}/media_files/requests/{request_id}"
         )
-        return response.json()
 
-    async def download_mediafile(self, url: str, file: BinaryIO):
+    async def download_mediafile(self, url: str, file: BinaryIO, offload_writes: bool = False):
         """
         Download and save a media file
 
         Args:
             url: Download URL
             file: File to save the media file to
+            offload_writes: If True, write chunks in a worker thread so that receiving the
+                next chunk overlaps with writing the previous one. This helps when several
+                downloads run concurrently, but may be slower for a single download to a
+                fast local disk.
 
         Raises:
             SafieMediaFileError: On download error
         """
         # Stream download
         try:
-            async for chunk in self._client.sync_stream(url):
-                file.write(chunk)
+            if not offload_writes:
+                async for chunk in self._client.sync_stream(url):
+                    file.write(chunk)
+                return
+
+            loop = asyncio.get_running_loop()
+            pending_write: Optional[asyncio.Future] = None
+            try:
+                async for chunk in self._client.sync_stream(url):
+                    if pending_write is not None:
+                        await pending_write
+                    pending_write = loop.run_in_executor(None, file.write, chunk)
+            finally:
+                if pending_write is not None:
+                    await pending_write
         except Exception as e:
             raise SafieMediaFileError(f"Failed to download media file: {e}") from e
 
@@ -98,17 +163,25 @@ class MediaFileAPI:
         self,
         device_id: str,
         request_id: str,
-        max_retries: int = 10,
-        interval: float = 5.0,
+        *,
+        total_timeout: float = 600.0,
+        initial: float = 2.0,
+        factor: float = 1.5,
+        max_interval: float = 30.0,
     ) -> str:
         """
         Wait until the media file is ready
 
+        The status is polled with exponential backoff (plus a small random jitter)
+        until the media file is available or the total timeout elapses.
+
         Args:
             device_id: Device ID
             request_id: Request ID
-            max_retries: Maximum number of retries
-            interval: Retry interval (seconds)
+            total_timeout: Maximum time to wait in total (seconds)
+            initial: Initial polling interval (seconds)
+            factor: Multiplier applied to the polling interval after each poll
+            max_interval: Upper bound of the polling interval (seconds)
 
         Returns:
             str: Download URL
@@ -116,7 +189,10 @@ class MediaFileAPI:
         Raises:
             SafieMediaFileTimeoutError: On timeout
         """
-        for _ in range(max_retries):
+        loop = asyncio.get_running_loop()
+        deadline = loop.time() + total_timeout
+        delay = initial
+        while True:
             status = await self.get_mediafile_status(device_id, request_id)
             print(f"wait_for_mediafile_ready status: {status}")
             state = status["state"]
@@ -127,6 +203,10 @@ class MediaFileAPI:
                     f"Media file generation failed: {status.get('error', 'Unknown error')}"
                 )
 
-            await asyncio.sleep(interval)
+            remaining = deadline - loop.time()
+            if remaining <= 0:
+                break
+            await asyncio.sleep(min(delay + random.uniform(0, delay * 0.1), remaining))
+            delay = min(delay * factor, max_interval)
 
         raise SafieMediaFileTimeoutError(f"Media file generation timed out: {request_id}")
@@ -1,23 +1,129 @@
 import argparse
-import asyncio
+import importlib.util
+import json
+import logging
+import sys
+from typing import List
+
+import anyio
+import httpx
 
 from safie_mediafile import DeviceAPI, MediaFileAPI, async_client
 
+# uvloop schedules tasks and handles sockets faster than the default event loop.
+# anyio runs on it when it is installed
+_HAS_UVLOOP = importlib.util.find_spec("uvloop") is not None
+
+logger = logging.getLogger(__name__)
 
-async def main(args: argparse.Namespace):
-    async with async_client(api_token=args.api_token) as client:
+
+async def main(args: argparse.Namespace) -> bool:
+    """Delete the mediafile requests of all devices. Returns False if any deletion failed."""
+    # All devices are cleaned up at once, each with args.concurrency delete workers. Keep a
+    # pooled connection for every worker so that deletes reuse sockets and, if the server
+    # falls back to HTTP/1.1, do not wait for a free connection
+    max_connections = args.concurrency * len(args.serial)
+    limits = httpx.Limits(
+        max_connections=max_connections,
+        max_keepalive_connections=max_connections,
+        keepalive_expiry=60.0,
+    )
+    async with async_client(api_token=args.api_token, limits=limits) as client:
         device_api = DeviceAPI(client)
-        device_id = await device_api.find_device_id(serial=args.serial)
         mediafile_api = MediaFileAPI(client)
-        mediafile_requests = await mediafile_api.list_mediafile_requests(device_id)
-        print(mediafile_requests)
-        for request in mediafile_requests:
-            await mediafile_api.delete_mediafile_request(device_id, request["request_id"])
+        failed_serials: List[str] = []
+        # Look up and clean up all devices concurrently so their round trips overlap
+        async with anyio.create_task_group() as tg:
+            for serial in args.serial:
+                tg.start_soon(
+                    _delete_device_mediafile_requests_logged,
+                    device_api,
+                    mediafile_api,
+                    serial,
+                    args.concurrency,
+                    failed_serials,
+                )
+    return not failed_serials
 
 
-if __name__ == "__main__":
+async def _delete_device_mediafile_requests_logged(
+    device_api: DeviceAPI,
+    mediafile_api: MediaFileAPI,
+    serial: str,
+    concurrency: int,
+    failed_serials: List[str],
+):
+    # Record the failure instead of raising it, which would cancel the other devices' tasks
+    try:
+        succeeded = await _delete_device_mediafile_requests(
+            device_api, mediafile_api, serial, concurrency
+        )
+    except Exception as e:
+        logger.error("Failed to delete mediafile requests of %s: %s", serial, e)
+        succeeded = False
+    if not succeeded:
+        failed_serials.append(serial)
+
+
+async def _delete_device_mediafile_requests(
+    device_api: DeviceAPI, mediafile_api: MediaFileAPI, serial: str, concurrency: int
+) -> bool:
+    device_id = await device_api.find_device_id(serial=serial)
+    mediafile_requests = await mediafile_api.list_mediafile_requests(device_id)
+    if not mediafile_requests:
+        logger.info("No mediafile requests for %s", serial)
+        return True
+    logger.info("Deleting %d mediafile requests of %s", len(mediafile_requests), serial)
+    if logger.isEnabledFor(logging.DEBUG):
+        # Dump as JSON rather than the repr of the dicts, so that the log can be scraped
+        logger.debug("Mediafile requests: %s", json.dumps(mediafile_requests, indent=2))
+
+    failures = await mediafile_api.delete_mediafile_requests(
+        device_id,
+        [request["request_id"] for request in mediafile_requests],
+        concurrency=concurrency,
+    )
+
+    logger.info(
+        "Deleted %d of %d mediafile requests of %s",
+        len(mediafile_requests) - len(failures),
+        len(mediafile_requests),
+        serial,
+    )
+    for request_id, error in failures.items():
+        logger.error("Failed to delete request %s: %s", request_id, error)
+    return not failures
+
+
+def _positive_int(value: str) -> int:
+    try:
+        number = int(value)
+    except ValueError:
+        raise argparse.ArgumentTypeError(f"invalid int value: {value!r}") from None
+    if number < 1:
+        raise argparse.ArgumentTypeError(f"must be at least 1, got {number}")
+    return number
+
+
+def _build_parser() -> argparse.ArgumentParser:
     parser = argparse.ArgumentParser()
-    parser.add_argument("--serial", type=str, required=True)
+    parser.add_argument("--serial", type=str, nargs="+", required=True)
     parser.add_argument("--api-token", type=str, required=True)
-    args = parser.parse_args()
-    asyncio.run(main(args))
+    parser.add_argument(
+        "--concurrency",
+        type=_positive_int,
+        default=8,
+        help="Number of concurrent delete requests",
+    )
+    parser.add_argument("--verbose", action="store_true", help="Enable debug logging")
+    return parser
+
+
+if __name__ == "__main__":
+    args = _build_parser().parse_args()
+    logging.basicConfig(level=logging.DEBUG if args.verbose else logging.INFO)
+    if not args.verbose:
+        # httpx logs every request at INFO level
+        logging.getLogger("httpx").setLevel(logging.WARNING)
+    if not anyio.run(main, args, backend_options={"use_uvloop": _HAS_UVLOOP}):
+        sys.exit(1)
@@ -0,0 +1,15 @@
+from pathlib import Path
+
+from safie_mediafile._cli._downloader import _build_concat_filelist
+
+
+def test_build_concat_filelist():
+    """Test that segments are listed in order with outpoint for clipped segments"""
+    content = _build_concat_filelist([(Path("/tmp/0.mp4"), None), (Path("/tmp/1.mp4"), 30.0)])
+    assert content == "file '/tmp/0.mp4'\nfile '/tmp/1.mp4'\noutpoint 30.0\n"
+
+
+def test_build_concat_filelist_escapes_quotes():
+    """Test that single quotes in paths are escaped for the concat demuxer"""
+    content = _build_concat_filelist([(Path("/tmp/it's/0.mp4"), None)])
+    assert content == "file '/tmp/it'\\''s/0.mp4'\n"
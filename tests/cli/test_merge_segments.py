@@ -0,0 +1,60 @@
+import pytest
+
+from safie_mediafile._cli import _downloader
+from safie_mediafile._cli._downloader import _merge_segments
+
+
+async def test_merge_failure_leaves_no_output(tmp_path, monkeypatch):
+    """Test that a failed ffmpeg merge leaves neither the output nor a partial file"""
+    # Stand-in for ffmpeg which writes part of the output file and then fails
+    fake_ffmpeg = tmp_path / "ffmpeg"
+    fake_ffmpeg.write_text('#!/bin/sh\nfor last; do :; done\nprintf partial > "$last"\nexit 1\n')
+    fake_ffmpeg.chmod(0o755)
+    monkeypatch.setattr(_downloader, "_FFMPEG", str(fake_ffmpeg))
+
+    segments = []
+    for i in range(2):
+        segment_path = tmp_path / f"{i}_out.mp4"
+        segment_path.write_bytes(b"video")
+        segments.append((segment_path, None))
+    output_path = tmp_path / "out.mp4"
+
+    with pytest.raises(RuntimeError, match="Failed to merge segments"):
+        await _merge_segments(segments, output_path, tmp_path)
+
+    assert not output_path.exists()
+    assert not list(tmp_path.glob("out.mp4.part*"))
+
+
+async def test_move_failure_leaves_no_output(tmp_path, monkeypatch):
+    """Test that an interrupted single-segment move leaves neither the output nor a partial file"""
+    segment_path = tmp_path / "0_out.mp4"
+    segment_path.write_bytes(b"video")
+    output_path = tmp_path / "out.mp4"
+
+    def _partial_move(src, dst, copy_function):
+        with open(dst, "wb") as f:
+            f.write(b"vi")
+        raise OSError("No space left on device")
+
+    monkeypatch.setattr(_downloader.shutil, "move", _partial_move)
+
+    with pytest.raises(OSError):
+        await _merge_segments([(segment_path, None)], output_path, tmp_path)
+
+    assert not output_path.exists()
+    assert not list(tmp_path.glob("out.mp4.part*"))
+
+
+async def test_move_single_segment(tmp_path):
+    """Test that a single segment without clipping is moved to the output path"""
+    segment_path = tmp_path / "0_out.mp4"
+    segment_path.write_bytes(b"video")
+    output_path = tmp_path / "out" / "out.mp4"
+    output_path.parent.mkdir()
+
+    await _merge_segments([(segment_path, None)], output_path, tmp_path)
+
+    assert output_path.read_bytes() == b"video"
+    assert not segment_path.exists()
+    assert not list(output_path.parent.glob("*.part*"))
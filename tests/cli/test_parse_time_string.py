@@ -1,50 +1,112 @@
 import pytest
 from datetime import datetime, timezone, timedelta
+from dateutil.parser import isoparse
+from dateutil.tz import gettz
+from safie_mediafile._cli import _cli_app
 from safie_mediafile._cli._cli_app import _parse_time_string
 
+JST = timezone(timedelta(hours=9), "JST")
 
-def test_parse_iso_format_with_timezone():
-    """Test parsing ISO format strings with timezone information"""
-    # With UTC offset
-    dt = _parse_time_string("2023-01-01T12:00:00+00:00", timezone.utc)
-    assert dt == datetime(2023, 1, 1, 12, 0, 0, tzinfo=timezone.utc)
 
-    # With JST offset
-    dt = _parse_time_string("2023-01-01T12:00:00+09:00", timezone.utc)
-    assert dt == datetime(2023, 1, 1, 12, 0, 0, tzinfo=timezone(timedelta(hours=9)))
+@pytest.mark.parametrize(
+    "time_string, default_tz, expected",
+    [
+        pytest.param(
+            "2023-01-01T12:00:00+00:00",
+            timezone.utc,
+            datetime(2023, 1, 1, 12, 0, 0, tzinfo=timezone.utc),
+            id="utc-offset",
+        ),
+        # Timezone specified in string takes precedence over default timezone
+        pytest.param(
+            "2023-01-01T12:00:00+09:00",
+            timezone.utc,
+            datetime(2023, 1, 1, 12, 0, 0, tzinfo=timezone(timedelta(hours=9))),
+            id="jst-offset-overrides-default",
+        ),
+        pytest.param(
+            "2023-01-01T12:00:00",
+            timezone.utc,
+            datetime(2023, 1, 1, 12, 0, 0, tzinfo=timezone.utc),
+            id="naive-utc-default",
+        ),
+        pytest.param(
+            "2023-01-01T12:00:00",
+            JST,
+            datetime(2023, 1, 1, 12, 0, 0, tzinfo=JST),
+            id="naive-jst-default",
+        ),
+        # dateutil timezones are not hashable, so they must not be part of a cache key
+        pytest.param(
+            "2023-01-01T12:00:00",
+            gettz("Asia/Tokyo"),
+            datetime(2023, 1, 1, 12, 0, 0, tzinfo=timezone(timedelta(hours=9))),
+            id="naive-dateutil-default",
+        ),
+        # Z is treated as +00:00 (UTC)
+        pytest.param(
+            "2023-01-01T12:00:00Z",
+            timezone(timedelta(hours=9)),
+            datetime(2023, 1, 1, 12, 0, 0, tzinfo=timezone.utc),
+            id="utc-z-suffix",
+        ),
+        pytest.param(
+            "2023-01-01T12:00:00z",
+            timezone(timedelta(hours=9)),
+            datetime(2023, 1, 1, 12, 0, 0, tzinfo=timezone.utc),
+            id="utc-lowercase-z-suffix",
+        ),
+        pytest.param(
+            "2023-01-01T12:00:00.5+09:00",
+            timezone.utc,
+            datetime(2023, 1, 1, 12, 0, 0, 500000, tzinfo=timezone(timedelta(hours=9))),
+            id="fallback-fractional-seconds",
+        ),
+        pytest.param(
+            "2023-01-01t12:00:00",
+            timezone.utc,
+            datetime(2023, 1, 1, 12, 0, 0, tzinfo=timezone.utc),
+            id="lowercase-separator",
+        ),
+        pytest.param(
+            "2023-01-01T12:00:00+09:00:00",
+            timezone.utc,
+            datetime(2023, 1, 1, 12, 0, 0, tzinfo=timezone(timedelta(hours=9))),
+            id="offset-with-seconds",
+        ),
+        pytest.param(
+            "20230101T120000Z",
+            JST,
+            datetime(2023, 1, 1, 12, 0, 0, tzinfo=timezone.utc),
+            id="basic-format",
+        ),
+    ],
+)
+def test_parse_valid(time_string, default_tz, expected):
+    """Test parsing valid ISO format strings with and without timezone information"""
+    dt = _parse_time_string(time_string, default_tz)
+    assert dt == expected
+    assert dt.utcoffset() == expected.utcoffset()
 
-    # Timezone specified in string takes precedence over default timezone
-    dt = _parse_time_string("2023-01-01T12:00:00+09:00", timezone.utc)
-    assert dt != datetime(2023, 1, 1, 12, 0, 0, tzinfo=timezone.utc)
-    assert dt.utcoffset() == timedelta(hours=9)
 
-
-def test_parse_iso_format_without_timezone():
-    """Test parsing ISO format strings without timezone information"""
-    # Using UTC as default timezone
-    dt = _parse_time_string("2023-01-01T12:00:00", timezone.utc)
-    assert dt == datetime(2023, 1, 1, 12, 0, 0, tzinfo=timezone.utc)
-
-    # Using JST as default timezone
-    jst = timezone(timedelta(hours=9), "JST")
-    dt = _parse_time_string("2023-01-01T12:00:00", jst)
-    assert dt == datetime(2023, 1, 1, 12, 0, 0, tzinfo=jst)
-
-
-def test_parse_with_z_suffix():
-    """Test parsing time strings with Z suffix (UTC indicator)"""
-    dt = _parse_time_string("2023-01-01T12:00:00Z", timezone(timedelta(hours=9)))
-    # Z is treated as +00:00 (UTC)
-    assert dt == datetime(2023, 1, 1, 12, 0, 0, tzinfo=timezone.utc)
-    assert dt.utcoffset() == timedelta(0)
-
-
-def test_parse_invalid_format():
+@pytest.mark.parametrize(
+    "time_string",
+    [
+        pytest.param("not-a-date", id="not-a-date"),
+        pytest.param("2023/01/01 12:00:00", id="slash-separated"),
+    ],
+)
+def test_parse_invalid(time_string):
     """Test that invalid time formats raise ValueError"""
     with pytest.raises(ValueError) as exc_info:
-        _parse_time_string("not-a-date", timezone.utc)
+        _parse_time_string(time_string, timezone.utc)
     assert "Invalid time format" in str(exc_info.value)
 
-    with pytest.raises(ValueError) as exc_info:
-        _parse_time_string("2023/01/01 12:00:00", timezone.utc)
-    assert "Invalid time format" in str(exc_info.value)
+
+def test_fallback_parsers_skip_fast_parser():
+    """Test that a string rejected by the standard library parser is not parsed with it again"""
+    if _cli_app._parse_iso == datetime.fromisoformat:
+        assert datetime.fromisoformat not in _cli_app._FALLBACK_PARSERS
+    else:
+        assert datetime.fromisoformat in _cli_app._FALLBACK_PARSERS
+    assert _cli_app._FALLBACK_PARSERS[-1] is isoparse
@@ -0,0 +1 @@
+# Endpoints tests package
@@ -0,0 +1,63 @@
+import asyncio
+
+import pytest
+
+from safie_mediafile._endpoints._device import DeviceAPI
+from safie_mediafile._exceptions import SafieMediaFileError
+
+
+class _PagedDeviceAPI(DeviceAPI):
+    """DeviceAPI serving devices from memory instead of calling the API"""
+
+    def __init__(self, num_devices):
+        super().__init__(client=None)  # type: ignore[arg-type]
+        self._all_devices = [
+            {"device_id": f"id{i}", "serial": f"serial{i}", "setting": {"name": f"name{i}"}}
+            for i in range(num_devices)
+        ]
+        self.requested_offsets = []
+
+    async def list_devices(self, offset=0, limit=100):
+        self.requested_offsets.append(offset)
+        await asyncio.sleep(0)  # let concurrent lookups interleave
+        return {"list": self._all_devices[offset : offset + limit]}
+
+
+async def test_find_device_beyond_first_page():
+    """Test that devices after the first page are found"""
+    api = _PagedDeviceAPI(250)
+    assert await api.find_device_by_serial("serial230") == "id230"
+    assert api.requested_offsets == [0, 100, 200]
+
+
+async def test_find_device_stops_at_first_match():
+    """Test that no further pages are fetched once the device is found"""
+    api = _PagedDeviceAPI(250)
+    assert await api.find_device_by_name("name5") == "id5"
+    assert api.requested_offsets == [0]
+
+
+async def test_find_device_reuses_fetched_pages():
+    """Test that pages fetched by a previous lookup are not requested again"""
+    api = _PagedDeviceAPI(150)
+    assert await api.find_device_by_serial("serial120") == "id120"
+    assert await api.find_device_by_name("name10") == "id10"
+    assert await api.find_device_by_serial("missing") is None
+    assert api.requested_offsets == [0, 100]
+
+
+async def test_find_device_id_not_found():
+    """Test that an unknown device raises SafieMediaFileError"""
+    api = _PagedDeviceAPI(3)
+    with pytest.raises(SafieMediaFileError):
+        await api.find_device_id(serial="missing")
+
+
+async def test_concurrent_lookups_fetch_each_page_once():
+    """Test that concurrent lookups share fetched pages instead of fetching them twice"""
+    api = _PagedDeviceAPI(250)
+    results = await asyncio.gather(
+        api.find_device_by_serial("serial230"), api.find_device_by_name("name150")
+    )
+    assert results == ["id230", "id150"]
+    assert api.requested_offsets == [0, 100, 200]
@@ -0,0 +1,98 @@
+import io
+
+import pytest
+
+from safie_mediafile._endpoints._mediafile import MediaFileAPI
+from safie_mediafile._exceptions import SafieMediaFileError, SafieMediaFileTimeoutError
+
+
+class _StatusSequenceAPI(MediaFileAPI):
+    """MediaFileAPI returning a fixed sequence of statuses instead of calling the API"""
+
+    def __init__(self, statuses):
+        super().__init__(client=None)  # type: ignore[arg-type]
+        self._statuses = list(statuses)
+        self.calls = 0
+
+    async def get_mediafile_status(self, device_id, request_id):
+        self.calls += 1
+        return self._statuses.pop(0) if self._statuses else {"state": "PROCESSING"}
+
+
+async def test_wait_for_mediafile_ready_returns_url():
+    """Test that polling continues until the media file is available"""
+    api = _StatusSequenceAPI(
+        [{"state": "PROCESSING"}, {"state": "PROCESSING"}, {"state": "AVAILABLE", "url": "u"}]
+    )
+    url = await api.wait_for_mediafile_ready("device", "request", initial=0.001)
+    assert url == "u"
+    assert api.calls == 3
+
+
+async def test_wait_for_mediafile_ready_failed():
+    """Test that a failed media file generation raises SafieMediaFileError"""
+    api = _StatusSequenceAPI([{"state": "FAILED", "error": "boom"}])
+    with pytest.raises(SafieMediaFileError) as exc_info:
+        await api.wait_for_mediafile_ready("device", "request", initial=0.001)
+    assert "boom" in str(exc_info.value)
+
+
+async def test_wait_for_mediafile_ready_timeout():
+    """Test that polling gives up once the total timeout has elapsed"""
+    api = _StatusSequenceAPI([])
+    with pytest.raises(SafieMediaFileTimeoutError):
+        await api.wait_for_mediafile_ready(
+            "device", "request", total_timeout=0.05, initial=0.01, max_interval=0.02
+        )
+    assert api.calls > 1
+
+
+class _FakeStreamClient:
+    def __init__(self, chunks):
+        self._chunks = chunks
+
+    async def sync_stream(self, url, chunk_size=None):
+        for chunk in self._chunks:
+            yield chunk
+
+
+@pytest.mark.parametrize("offload_writes", [False, True])
+async def test_download_mediafile_writes_all_chunks(offload_writes):
+    """Test that all streamed chunks are written to the file in order"""
+    chunks = [bytes([i]) * 10 for i in range(5)]
+    api = MediaFileAPI(_FakeStreamClient(chunks))  # type: ignore[arg-type]
+    file = io.BytesIO()
+    await api.download_mediafile("url", file, offload_writes=offload_writes)
+    assert file.getvalue() == b"".join(chunks)
+
+
+class _DeleteRecordingAPI(MediaFileAPI):
+    """MediaFileAPI recording deletes instead of calling the API"""
+
+    def __init__(self, failing_ids):
+        super().__init__(client=None)  # type: ignore[arg-type]
+        self._failing_ids = failing_ids
+        self.deleted = []
+
+    async def delete_mediafile_request(self, device_id, request_id):
+        if request_id in self._failing_ids:
+            raise RuntimeError(f"failed {request_id}")
+        self.deleted.append(request_id)
+
+
+async def test_delete_mediafile_requests_reports_failures():
+    """Test that all requests are deleted and failures are returned by request ID"""
+    api = _DeleteRecordingAPI({"r3"})
+    request_ids = [f"r{i}" for i in range(10)]
+    failures = await api.delete_mediafile_requests("device", request_ids, concurrency=3)
+    assert sorted(api.deleted) == sorted(set(request_ids) - {"r3"})
+    assert list(failures) == ["r3"]
+
+
+@pytest.mark.parametrize("concurrency", [0, -1])
+async def test_delete_mediafile_requests_rejects_invalid_concurrency(concurrency):
+    """Test that a concurrency below 1 is rejected instead of waiting forever"""
+    api = _DeleteRecordingAPI(set())
+    with pytest.raises(ValueError):
+        await api.delete_mediafile_requests("device", ["r0", "r1"], concurrency=concurrency)
+    assert api.deleted == []